@@ -2,15 +2,27 @@
 SQL Query Builder CLI - A type-safe SQL query builder inspired by jOOQ
 """
 
-import sqlite3
+import csv
+import os
+import sys
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import List, Optional, Any
+from functools import lru_cache
+from itertools import chain, count
+from typing import Dict, Iterable, Iterator, List, Optional, Any
 import click
-from tabulate import tabulate
+
+# Prefer pysqlite3 (e.g. pysqlite3-binary, or built against a tuned
+# libsqlite3) when installed; it is a drop-in for the stdlib module.
+try:
+    from pysqlite3 import dbapi2 as sqlite3
+except ImportError:
+    import sqlite3
 
 
 # Database Schema Models
-@dataclass
+@dataclass(slots=True)
 class User:
     id: Optional[int] = None
     name: Optional[str] = None
@@ -18,7 +30,7 @@ class User:
     age: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     id: Optional[int] = None
     name: Optional[str] = None
@@ -26,104 +38,330 @@ class Product:
     stock: Optional[int] = None
 
 
+# Result Cache
+# Keyed by (builder id, table generation, PRAGMA data_version, sql, params).
+# The generation is bumped by every write made through this module; the
+# connection's data_version changes whenever another connection or process
+# commits, so writes from elsewhere invalidate entries too. The key holds
+# plain values only, never the cursor or connection. Only long-lived
+# in-process use benefits; a CLI command runs one query per process.
+RESULT_CACHE_SIZE = 64
+_result_cache = OrderedDict()
+_table_generation = defaultdict(int)
+_builder_ids = count()
+
+
+def _invalidate(table: str):
+    _table_generation[table] += 1
+
+
+def _cached_fetch(cursor: sqlite3.Cursor, builder_id: int, table: str, sql: str, params: tuple) -> tuple:
+    try:
+        hash(params)
+    except TypeError:
+        # e.g. a bytearray bound as a BLOB: valid for sqlite3, but not a key
+        return tuple(cursor.execute(sql, params).fetchall())
+    
+    data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+    key = (builder_id, _table_generation[table], data_version, sql, params)
+    rows = _result_cache.get(key)
+    if rows is None:
+        rows = tuple(cursor.execute(sql, params).fetchall())
+        _result_cache[key] = rows
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    else:
+        _result_cache.move_to_end(key)
+    return rows
+
+
+# Known columns per table. Every table and column identifier passed to the
+# builders is checked against these (a frozenset lookup) before it is
+# interpolated into SQL text; only values travel as bound parameters.
+TABLE_COLUMNS = {
+    'users': frozenset(('id', 'name', 'email', 'age')),
+    'products': frozenset(('id', 'name', 'price', 'stock')),
+}
+
+
+def check_columns(table: str, fields) -> None:
+    allowed = TABLE_COLUMNS.get(table)
+    if allowed is None:
+        raise ValueError(f"Unknown table: {table}")
+    bad = [f for f in fields if f not in allowed]
+    if bad:
+        raise ValueError(f"Unknown column(s) for {table}: {', '.join(bad)}")
+
+
+@lru_cache(maxsize=128)
+def _select_sql(table: str, columns: tuple, order: tuple, where_clause: str, limit_clause: str) -> str:
+    order_clause = ""
+    if order:
+        order_clause = "ORDER BY " + ", ".join(f"{f} {d}" if d else f for f, d in order)
+    base = f"SELECT {', '.join(columns) or '*'} FROM {table}"
+    return " ".join(filter(None, (base, where_clause, order_clause, limit_clause)))
+
+
+@lru_cache(maxsize=128)
+def _insert_sql(table: str, columns: tuple) -> str:
+    fields = ", ".join(columns)
+    placeholders = ", ".join(["?" for _ in columns])
+    return f"INSERT INTO {table} ({fields}) VALUES ({placeholders})"
+
+
 # Query Builder Classes
 class QueryBuilder:
-    def __init__(self, conn: sqlite3.Connection):
-        self.conn = conn
-        self.cursor = conn.cursor()
+    __slots__ = ('conns', 'cursors', 'id')
+    
+    def __init__(self, conns: Dict[str, sqlite3.Connection]):
+        # One connection per table; tables may live in separate database files
+        self.conns = conns
+        # Long-lived cursor per table, shared by every query built here, so a
+        # session does not allocate a new cursor for each statement
+        self.cursors = {table: conn.cursor() for table, conn in conns.items()}
+        # Identifies this builder's connections in the result cache
+        self.id = next(_builder_ids)
     
     def select(self, table: str):
-        return SelectQuery(self.conn, table)
+        return SelectQuery(self, table)
     
     def insert(self, table: str):
-        return InsertQuery(self.conn, table)
+        return InsertQuery(self, table)
     
     def update(self, table: str):
-        return UpdateQuery(self.conn, table)
+        return UpdateQuery(self, table)
     
     def delete(self, table: str):
-        return DeleteQuery(self.conn, table)
+        return DeleteQuery(self, table)
+    
+    @contextmanager
+    def transaction(self, *tables: str, mode: str = "IMMEDIATE"):
+        """Group several writes into one commit; rolls back if the block raises.
+        
+        Covers the given tables (default: all). Each database file commits
+        separately, so a transaction spanning files is not atomic across them.
+        """
+        if mode not in ("DEFERRED", "IMMEDIATE", "EXCLUSIVE"):
+            raise ValueError(f"Invalid transaction mode: {mode}")
+        conns = list(dict.fromkeys(self.conns[t] for t in tables or self.conns))
+        begun = []
+        try:
+            for conn in conns:
+                conn.execute(f"BEGIN {mode}")
+                begun.append(conn)
+            yield self
+            for conn in begun:
+                conn.execute("COMMIT")
+        except BaseException:
+            for conn in begun:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+            # Results read inside the transaction may include rolled-back rows
+            _result_cache.clear()
+            raise
+    
+    @contextmanager
+    def bulk_load(self, table: str):
+        """Exclusive transaction with journaling and fsync disabled, for seed loads.
+        
+        Without a journal a crash or failed statement mid-load can leave the
+        database partially written or corrupt, so only use this on data you
+        can reload. WAL and synchronous=NORMAL are restored afterwards.
+        
+        Leaving WAL needs every other connection to the file closed; if one is
+        open the load still runs, in WAL with only fsync disabled.
+        """
+        conn = self.conns[table]
+        foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+        try:
+            journal_mode = conn.execute("PRAGMA journal_mode=OFF").fetchone()[0]
+        except sqlite3.OperationalError:
+            # "database is locked": another connection has the file open
+            journal_mode = "wal"
+        if journal_mode.lower() != "off":
+            click.echo(f"Warning: database in use, loading with journal_mode={journal_mode}", err=True)
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA foreign_keys=OFF")
+        try:
+            with self.transaction(table, mode="EXCLUSIVE"):
+                yield self
+        finally:
+            if journal_mode.lower() == "off":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA foreign_keys={int(foreign_keys)}")
 
 
 class SelectQuery:
-    def __init__(self, conn: sqlite3.Connection, table: str):
-        self.conn = conn
+    __slots__ = ('cursor', 'builder_id', 'table', 'columns', 'where_clause', 'order',
+                 'limit_clause', 'limit_value', 'params', 'sql')
+    
+    def __init__(self, qb: QueryBuilder, table: str):
+        check_columns(table, ())
+        self.cursor = qb.cursors[table]
+        self.builder_id = qb.id
         self.table = table
-        self.columns = "*"
+        self.columns = ()
         self.where_clause = ""
-        self.order_clause = ""
+        self.order = ()
         self.limit_clause = ""
+        self.limit_value = None
         self.params = []
+        self.sql = None
     
     def fields(self, *fields):
-        self.columns = ", ".join(fields)
+        check_columns(self.table, fields)
+        self.columns = fields
+        self.sql = None
         return self
     
     def where(self, condition: str, *params):
         self.where_clause = f"WHERE {condition}"
         self.params.extend(params)
+        self.sql = None
         return self
     
     def order_by(self, *fields):
-        self.order_clause = f"ORDER BY {', '.join(fields)}"
+        order = []
+        for term in fields:
+            field, _, direction = term.partition(" ")
+            direction = direction.strip().upper()
+            if direction not in ("", "ASC", "DESC"):
+                raise ValueError(f"Invalid sort direction: {direction}")
+            order.append((field, direction))
+        check_columns(self.table, [f for f, _ in order])
+        self.order = tuple(order)
+        self.sql = None
         return self
     
     def limit(self, count: int):
-        self.limit_clause = f"LIMIT {count}"
+        # Bound as a parameter so every limit value shares one statement
+        self.limit_value = int(count)
+        if not self.limit_clause:
+            self.limit_clause = "LIMIT ?"
+            self.sql = None
         return self
     
-    def fetch(self) -> List[tuple]:
-        query = f"SELECT {self.columns} FROM {self.table}"
-        if self.where_clause:
-            query += f" {self.where_clause}"
-        if self.order_clause:
-            query += f" {self.order_clause}"
+    def build(self) -> str:
+        # Built once per instance; the same shape also yields the same SQL
+        # text across instances, so sqlite3's statement cache is hit
+        if self.sql is None:
+            self.sql = _select_sql(self.table, self.columns, self.order, self.where_clause, self.limit_clause)
+        return self.sql
+    
+    def bound_params(self) -> tuple:
         if self.limit_clause:
-            query += f" {self.limit_clause}"
+            return (*self.params, self.limit_value)
+        return tuple(self.params)
+    
+    def fetch(self) -> List[tuple]:
+        return list(_cached_fetch(self.cursor, self.builder_id, self.table, self.build(), self.bound_params()))
+    
+    def fetch_iter(self) -> sqlite3.Cursor:
+        """Stream rows straight from the cursor, bypassing the result cache.
         
-        cursor = self.conn.cursor()
-        cursor.execute(query, self.params)
-        return cursor.fetchall()
+        Rows are plain tuples (no row_factory), the cheapest row type sqlite3
+        produces, and are never collected into a list. Uses its own cursor so
+        other queries can run on the shared one while this is being consumed.
+        """
+        return self.cursor.connection.execute(self.build(), self.bound_params())
     
     def fetch_one(self) -> Optional[tuple]:
         results = self.limit(1).fetch()
         return results[0] if results else None
+    
+    def aggregate(self, column: str) -> tuple:
+        """Return (count, sum, avg, min, max) of a column, computed inside SQLite"""
+        check_columns(self.table, (column,))
+        query = f"SELECT COUNT({column}), SUM({column}), AVG({column}), MIN({column}), MAX({column}) FROM {self.table}"
+        if self.where_clause:
+            query += f" {self.where_clause}"
+        
+        return _cached_fetch(self.cursor, self.builder_id, self.table, query, tuple(self.params))[0]
 
 
 class InsertQuery:
-    def __init__(self, conn: sqlite3.Connection, table: str):
-        self.conn = conn
+    __slots__ = ('cursor', 'table', 'values_dict', 'rows')
+    
+    def __init__(self, qb: QueryBuilder, table: str):
+        check_columns(table, ())
+        self.cursor = qb.cursors[table]
         self.table = table
         self.values_dict = {}
+        self.rows = []
     
     def set(self, field: str, value: Any):
+        check_columns(self.table, (field,))
         self.values_dict[field] = value
         return self
     
     def values(self, **kwargs):
+        check_columns(self.table, kwargs)
         self.values_dict.update(kwargs)
         return self
     
+    def values_many(self, rows: List[dict]):
+        rows = list(rows)
+        if rows:
+            # Later batches must match the rows already queued
+            keys = (self.rows or rows)[0].keys()
+            check_columns(self.table, keys)
+            for row in rows:
+                if row.keys() != keys:
+                    raise ValueError("All rows must have the same fields")
+        self.rows.extend(rows)
+        return self
+    
     def execute(self) -> int:
-        fields = ", ".join(self.values_dict.keys())
-        placeholders = ", ".join(["?" for _ in self.values_dict])
-        query = f"INSERT INTO {self.table} ({fields}) VALUES ({placeholders})"
+        query = _insert_sql(self.table, tuple(self.values_dict))
+        self.cursor.execute(query, tuple(self.values_dict.values()))
+        _invalidate(self.table)
+        return self.cursor.lastrowid
+    
+    def execute_many(self) -> int:
+        if not self.rows:
+            return 0
+        
+        columns = tuple(self.rows[0])
+        return self.execute_stream(columns, (tuple(row[c] for c in columns) for row in self.rows))
+    
+    def execute_stream(self, columns: tuple, rows: Iterable[tuple]) -> int:
+        """Insert value tuples for `columns`, consuming `rows` lazily"""
+        check_columns(self.table, columns)
+        query = _insert_sql(self.table, tuple(columns))
         
-        cursor = self.conn.cursor()
-        cursor.execute(query, list(self.values_dict.values()))
-        self.conn.commit()
-        return cursor.lastrowid
+        # One transaction for the whole batch instead of a commit per row,
+        # unless the caller already opened one via QueryBuilder.transaction()
+        owns_transaction = not self.cursor.connection.in_transaction
+        if owns_transaction:
+            self.cursor.execute("BEGIN")
+        try:
+            self.cursor.executemany(query, rows)
+            # Read before COMMIT, which runs on the same cursor and resets it
+            inserted = self.cursor.rowcount
+            if owns_transaction:
+                self.cursor.execute("COMMIT")
+        except Exception:
+            if owns_transaction:
+                self.cursor.execute("ROLLBACK")
+            raise
+        _invalidate(self.table)
+        return inserted
 
 
 class UpdateQuery:
-    def __init__(self, conn: sqlite3.Connection, table: str):
-        self.conn = conn
+    __slots__ = ('cursor', 'table', 'set_dict', 'where_clause', 'where_params')
+    
+    def __init__(self, qb: QueryBuilder, table: str):
+        check_columns(table, ())
+        self.cursor = qb.cursors[table]
         self.table = table
         self.set_dict = {}
         self.where_clause = ""
         self.where_params = []
     
     def set(self, field: str, value: Any):
+        check_columns(self.table, (field,))
         self.set_dict[field] = value
         return self
     
@@ -134,21 +372,20 @@ class UpdateQuery:
     
     def execute(self) -> int:
         set_clause = ", ".join([f"{k} = ?" for k in self.set_dict.keys()])
-        query = f"UPDATE {self.table} SET {set_clause}"
-        
-        if self.where_clause:
-            query += f" {self.where_clause}"
+        query = " ".join(filter(None, (f"UPDATE {self.table} SET {set_clause}", self.where_clause)))
         
         params = list(self.set_dict.values()) + self.where_params
-        cursor = self.conn.cursor()
-        cursor.execute(query, params)
-        self.conn.commit()
-        return cursor.rowcount
+        self.cursor.execute(query, params)
+        _invalidate(self.table)
+        return self.cursor.rowcount
 
 
 class DeleteQuery:
-    def __init__(self, conn: sqlite3.Connection, table: str):
-        self.conn = conn
+    __slots__ = ('cursor', 'table', 'where_clause', 'params')
+    
+    def __init__(self, qb: QueryBuilder, table: str):
+        check_columns(table, ())
+        self.cursor = qb.cursors[table]
         self.table = table
         self.where_clause = ""
         self.params = []
@@ -159,43 +396,197 @@ class DeleteQuery:
         return self
     
     def execute(self) -> int:
-        query = f"DELETE FROM {self.table}"
-        if self.where_clause:
-            query += f" {self.where_clause}"
+        query = " ".join(filter(None, (f"DELETE FROM {self.table}", self.where_clause)))
         
-        cursor = self.conn.cursor()
-        cursor.execute(query, self.params)
-        self.conn.commit()
-        return cursor.rowcount
+        self.cursor.execute(query, self.params)
+        _invalidate(self.table)
+        return self.cursor.rowcount
 
 
 # Database Setup
-def init_database(db_path: str = "app.db") -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
+# Size of sqlite3's per-connection prepared statement cache (keyed by SQL text).
+# Identical query shapes, e.g. repeated get_user lookups, skip parse + plan.
+STATEMENT_CACHE_SIZE = 256
+
+# Bump when upgrade_schema() gains a new step
+SCHEMA_VERSION = 2
+
+
+# users and products are independent, so each gets its own file: separate
+# write locks, WAL files and fsync streams let writes to both run in parallel
+DATABASE_FILES = {
+    'users': 'users.db',
+    'products': 'products.db',
+}
+
+# Single-file database used before the split; migrated on first open
+LEGACY_DB_PATH = "app.db"
+
+
+def init_database(db_dir: str = ".") -> Dict[str, sqlite3.Connection]:
+    """Open one connection per table, keyed by table name"""
+    legacy_path = os.path.join(db_dir, LEGACY_DB_PATH)
+    return {
+        table: open_database(os.path.join(db_dir, filename), (table,), legacy_path)
+        for table, filename in DATABASE_FILES.items()
+    }
+
+
+def open_database(db_path: str, tables: tuple, legacy_path: Optional[str] = None) -> sqlite3.Connection:
+    # isolation_level=None: autocommit, so single-statement writes carry no
+    # implicit BEGIN/COMMIT; multi-statement work opens transactions explicitly
+    conn = sqlite3.connect(db_path, isolation_level=None, cached_statements=STATEMENT_CACHE_SIZE)
+
+    # WAL lets readers run alongside a writer and, with synchronous=NORMAL,
+    # avoids an fsync on every commit. journal_mode is persistent per file.
+    journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    if journal_mode.lower() != "wal":
+        click.echo(f"Warning: could not enable WAL (journal_mode={journal_mode})", err=True)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=268435456")
+
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        create_schema(conn, tables, legacy_path)
+    return conn
+
+
+def create_schema(conn: sqlite3.Connection, tables: tuple, legacy_path: Optional[str] = None):
+    """Create or upgrade the schema for `tables`; tracked in PRAGMA user_version so it runs once per file"""
     cursor = conn.cursor()
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
     
-    # Create users table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            age INTEGER
-        )
-    """)
-    
-    # Create products table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS products (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            price REAL NOT NULL,
-            stock INTEGER DEFAULT 0
-        )
-    """)
-    
-    conn.commit()
-    return conn
+    # ATTACH is not allowed inside a transaction, so attach before locking
+    attached = version < 1 and legacy_path is not None and os.path.exists(legacy_path)
+    if attached:
+        cursor.execute("ATTACH DATABASE ? AS legacy", (legacy_path,))
+    try:
+        # Take the write lock first, then re-read the version: another
+        # process opening the same file may have upgraded it meanwhile
+        cursor.execute("BEGIN IMMEDIATE")
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            cursor.execute("COMMIT")
+            return
+        upgrade_schema(cursor, version, tables, migrate=attached and version < 1)
+        cursor.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+    finally:
+        if attached:
+            cursor.execute("DETACH DATABASE legacy")
+
+
+def upgrade_schema(cursor: sqlite3.Cursor, version: int, tables: tuple, migrate: bool):
+    """Apply the schema steps after `version`; runs inside create_schema's transaction"""
+    if version < 1:
+        if 'users' in tables:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    email TEXT UNIQUE NOT NULL,
+                    age INTEGER
+                )
+            """)
+            
+            # Index filtered columns
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_age ON users(age)")
+        
+        if 'products' in tables:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS products (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    stock INTEGER DEFAULT 0
+                )
+            """)
+        
+        if migrate:
+            # Copy rows over from the pre-split single-file database
+            for table in tables:
+                cursor.execute(
+                    "SELECT 1 FROM legacy.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+                )
+                if cursor.fetchone():
+                    cursor.execute(f"INSERT INTO main.{table} SELECT * FROM legacy.{table}")
+    
+    if version < 2 and 'users' in tables:
+        # Covering index: search-users (age filter + ORDER BY age) is answered
+        # from the index alone. It makes the plain age index redundant.
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_age_cover ON users(age, id, name, email)")
+        cursor.execute("DROP INDEX IF EXISTS idx_users_age")
+    
+    # Refresh planner statistics after any schema change
+    cursor.execute("ANALYZE main")
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+# Output Formatting
+def format_grid(rows: Iterable[tuple], headers: List[str]) -> str:
+    """Render rows as a grid table; numeric columns are right-aligned"""
+    widths = [len(h) for h in headers]
+    numeric = [True] * len(headers)
+    cells = []
+    
+    # Single pass: stringify every value and track column widths/types
+    for row in rows:
+        cell_row = []
+        for i, value in enumerate(row):
+            if value is None:
+                text = ""
+            else:
+                text = str(value)
+                if numeric[i] and not isinstance(value, (int, float)):
+                    numeric[i] = False
+            if len(text) > widths[i]:
+                widths[i] = len(text)
+            cell_row.append(text)
+        cells.append(cell_row)
+    
+    def border(char: str) -> str:
+        return "+" + "+".join(char * (w + 2) for w in widths) + "+"
+    
+    def line(values) -> str:
+        padded = [v.rjust(w) if num else v.ljust(w) for v, w, num in zip(values, widths, numeric)]
+        return "| " + " | ".join(padded) + " |"
+    
+    separator = border("-")
+    out = [separator, line(headers), border("=")]
+    for cell_row in cells:
+        out.append(line(cell_row))
+        out.append(separator)
+    return "\n".join(out)
+
+
+def write_tsv(rows: Iterable[tuple], headers: List[str], out) -> None:
+    """Write tab-separated rows, header first, one row at a time"""
+    # csv quotes values holding a tab, newline or quote so each row stays
+    # one record; None is written as an empty field
+    writer = csv.writer(out, delimiter='\t', lineterminator='\n')
+    writer.writerow(headers)
+    writer.writerows(rows)
+
+
+def echo_rows(rows: Iterable[tuple], headers: List[str], fmt: str = 'grid') -> bool:
+    """Write rows in the given format; returns False without output if there are none"""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return False
+    rows = chain([first], rows)
+    
+    if fmt == 'tsv':
+        # Stream to the buffered stdout so memory stays flat for any row count
+        write_tsv(rows, headers, sys.stdout)
+        sys.stdout.flush()
+    else:
+        click.echo(format_grid(rows, headers))
+    return True
 
 
 # CLI Commands
@@ -204,18 +595,98 @@ def init_database(db_path: str = "app.db") -> sqlite3.Connection:
 def cli(ctx):
     """SQL Query Builder CLI - A jOOQ-inspired query builder for Python"""
     ctx.ensure_object(dict)
-    ctx.obj['conn'] = init_database()
-    ctx.obj['qb'] = QueryBuilder(ctx.obj['conn'])
+    # Open the database only once a command actually needs it
+    ctx.obj['conn_factory'] = lambda: init_database()
+
+
+def get_qb(ctx) -> QueryBuilder:
+    """Return the session QueryBuilder, opening the database on first use"""
+    if 'qb' not in ctx.obj:
+        ctx.obj['conns'] = ctx.obj['conn_factory']()
+        ctx.obj['qb'] = QueryBuilder(ctx.obj['conns'])
+    return ctx.obj['qb']
+
+
+# Marks a CSV column whose cells may not be empty
+REQUIRED = object()
+
+# (column, converter, value for an empty cell) per table for CSV imports;
+# mirrors the NOT NULL / DEFAULT constraints in upgrade_schema()
+CSV_COLUMNS = {
+    'users': (('name', str, REQUIRED), ('email', str, REQUIRED), ('age', int, None)),
+    'products': (('name', str, REQUIRED), ('price', float, REQUIRED), ('stock', int, 0)),
+}
+
+
+def convert_csv_value(value: Optional[str], column: str, converter, default, line: int):
+    if value is None or not value.strip():
+        if default is REQUIRED:
+            raise click.BadParameter(f"line {line}: {column} is required")
+        return default
+    try:
+        return converter(value)
+    except ValueError:
+        raise click.BadParameter(f"line {line}: invalid {column} value {value!r}") from None
+
+
+def iter_csv_rows(file, table: str) -> Iterator[tuple]:
+    """Stream type-converted value tuples for `table` from a CSV file with a header row.
+    
+    The header is checked immediately; rows are read and converted one at a
+    time as the returned iterator is consumed, in CSV_COLUMNS order.
+    """
+    columns = CSV_COLUMNS[table]
+    reader = csv.reader(file)
+    header = next(reader, [])
+    missing = [c for c, _, _ in columns if c not in header]
+    if missing:
+        raise click.BadParameter(f"CSV is missing column(s): {', '.join(missing)}")
+    fields = [(header.index(c), c, converter, default) for c, converter, default in columns]
+    
+    def rows():
+        for row in reader:
+            if not row:
+                # Blank line, skipped as csv.DictReader used to
+                continue
+            yield tuple(
+                convert_csv_value(row[i] if i < len(row) else None, c, converter, default, reader.line_num)
+                for i, c, converter, default in fields
+            )
+    
+    return rows()
+
+
+def read_csv_rows(file, table: str) -> List[dict]:
+    """Read and type-convert rows for `table` from a CSV file with a header row"""
+    names = [c for c, _, _ in CSV_COLUMNS[table]]
+    return [dict(zip(names, row)) for row in iter_csv_rows(file, table)]
 
 
 @cli.command()
-@click.option('--name', prompt='Name', help='User name')
-@click.option('--email', prompt='Email', help='User email')
-@click.option('--age', prompt='Age', type=int, help='User age')
+@click.option('--name', help='User name')
+@click.option('--email', help='User email')
+@click.option('--age', type=int, help='User age')
+@click.option('--file', type=click.File('r'), help='CSV file with name,email,age columns')
 @click.pass_context
-def add_user(ctx, name, email, age):
+def add_user(ctx, name, email, age, file):
     """Add a new user to the database"""
-    qb = ctx.obj['qb']
+    qb = get_qb(ctx)
+    
+    if file:
+        rows = read_csv_rows(file, 'users')
+        try:
+            count = qb.insert('users').values_many(rows).execute_many()
+            click.echo(f"✓ {count} users created successfully")
+        except sqlite3.IntegrityError:
+            click.echo("✗ Error: Email already exists! No users were created.", err=True)
+        return
+    
+    if name is None:
+        name = click.prompt('Name')
+    if email is None:
+        email = click.prompt('Email')
+    if age is None:
+        age = click.prompt('Age', type=int)
     
     try:
         user_id = qb.insert('users').values(
@@ -230,17 +701,35 @@ def add_user(ctx, name, email, age):
 
 
 @cli.command()
+@click.option('--csv', 'csv_file', type=click.File('r'), required=True,
+              help='CSV file with name,email,age columns')
+@click.pass_context
+def load_users(ctx, csv_file):
+    """Seed users from a CSV file as fast as possible (no journal; not crash-safe)"""
+    qb = get_qb(ctx)
+    
+    # Stream straight from the file into executemany; memory stays flat
+    rows = iter_csv_rows(csv_file, 'users')
+    columns = tuple(c for c, _, _ in CSV_COLUMNS['users'])
+    try:
+        with qb.bulk_load('users'):
+            count = qb.insert('users').execute_stream(columns, rows)
+        click.echo(f"✓ {count} users loaded successfully")
+    except sqlite3.IntegrityError:
+        click.echo("✗ Error: Email already exists! The load was aborted.", err=True)
+
+
+@cli.command()
+@click.option('--format', 'fmt', type=click.Choice(['grid', 'tsv']), default='grid', help='Output format')
 @click.pass_context
-def list_users(ctx):
+def list_users(ctx, fmt):
     """List all users"""
-    qb = ctx.obj['qb']
+    qb = get_qb(ctx)
     
-    users = qb.select('users').order_by('id').fetch()
+    users = qb.select('users').order_by('id').fetch_iter()
     
-    if users:
-        headers = ['ID', 'Name', 'Email', 'Age']
-        click.echo(tabulate(users, headers=headers, tablefmt='grid'))
-    else:
+    headers = ['ID', 'Name', 'Email', 'Age']
+    if not echo_rows(users, headers, fmt):
         click.echo("No users found.")
 
 
@@ -249,7 +738,7 @@ def list_users(ctx):
 @click.pass_context
 def get_user(ctx, user_id):
     """Get a specific user by ID"""
-    qb = ctx.obj['qb']
+    qb = get_qb(ctx)
     
     user = qb.select('users').where('id = ?', user_id).fetch_one()
     
@@ -271,7 +760,7 @@ def get_user(ctx, user_id):
 @click.pass_context
 def update_user(ctx, user_id, name, email, age):
     """Update user information"""
-    qb = ctx.obj['qb']
+    qb = get_qb(ctx)
     
     query = qb.update('users')
     
@@ -296,7 +785,7 @@ def update_user(ctx, user_id, name, email, age):
 @click.pass_context
 def delete_user(ctx, user_id):
     """Delete a user"""
-    qb = ctx.obj['qb']
+    qb = get_qb(ctx)
     
     rows = qb.delete('users').where('id = ?', user_id).execute()
     
@@ -307,13 +796,27 @@ def delete_user(ctx, user_id):
 
 
 @cli.command()
-@click.option('--name', prompt='Product name', help='Product name')
-@click.option('--price', prompt='Price', type=float, help='Product price')
-@click.option('--stock', prompt='Stock', type=int, default=0, help='Product stock')
+@click.option('--name', help='Product name')
+@click.option('--price', type=float, help='Product price')
+@click.option('--stock', type=int, help='Product stock')
+@click.option('--file', type=click.File('r'), help='CSV file with name,price,stock columns')
 @click.pass_context
-def add_product(ctx, name, price, stock):
+def add_product(ctx, name, price, stock, file):
     """Add a new product"""
-    qb = ctx.obj['qb']
+    qb = get_qb(ctx)
+    
+    if file:
+        rows = read_csv_rows(file, 'products')
+        count = qb.insert('products').values_many(rows).execute_many()
+        click.echo(f"✓ {count} products created successfully")
+        return
+    
+    if name is None:
+        name = click.prompt('Product name')
+    if price is None:
+        price = click.prompt('Price', type=float)
+    if stock is None:
+        stock = click.prompt('Stock', type=int, default=0)
     
     product_id = qb.insert('products').values(
         name=name,
@@ -325,26 +828,26 @@ def add_product(ctx, name, price, stock):
 
 
 @cli.command()
+@click.option('--format', 'fmt', type=click.Choice(['grid', 'tsv']), default='grid', help='Output format')
 @click.pass_context
-def list_products(ctx):
+def list_products(ctx, fmt):
     """List all products"""
-    qb = ctx.obj['qb']
+    qb = get_qb(ctx)
     
     products = qb.select('products').order_by('id').fetch()
     
-    if products:
-        headers = ['ID', 'Name', 'Price', 'Stock']
-        click.echo(tabulate(products, headers=headers, tablefmt='grid'))
-    else:
+    headers = ['ID', 'Name', 'Price', 'Stock']
+    if not echo_rows(products, headers, fmt):
         click.echo("No products found.")
 
 
 @cli.command()
 @click.option('--min-age', type=int, help='Minimum age filter')
+@click.option('--format', 'fmt', type=click.Choice(['grid', 'tsv']), default='grid', help='Output format')
 @click.pass_context
-def search_users(ctx, min_age):
+def search_users(ctx, min_age, fmt):
     """Search users with filters"""
-    qb = ctx.obj['qb']
+    qb = get_qb(ctx)
     
     if min_age:
         users = qb.select('users').where('age >= ?', min_age).order_by('age').fetch()
@@ -353,12 +856,39 @@ def search_users(ctx, min_age):
         users = qb.select('users').order_by('id').fetch()
         click.echo("\nAll users:")
     
-    if users:
-        headers = ['ID', 'Name', 'Email', 'Age']
-        click.echo(tabulate(users, headers=headers, tablefmt='grid'))
-    else:
+    headers = ['ID', 'Name', 'Email', 'Age']
+    if not echo_rows(users, headers, fmt):
         click.echo("No users found.")
 
 
+# Columns that can be summarised by the aggregate command
+NUMERIC_COLUMNS = {
+    'users': ['age'],
+    'products': ['price', 'stock'],
+}
+
+
+@cli.command()
+@click.argument('table', type=click.Choice(list(NUMERIC_COLUMNS)))
+@click.argument('column')
+@click.pass_context
+def aggregate(ctx, table, column):
+    """Show count, sum, average, min and max of a numeric column"""
+    if column not in NUMERIC_COLUMNS[table]:
+        raise click.BadParameter(
+            f"must be one of: {', '.join(NUMERIC_COLUMNS[table])}", param_hint="'COLUMN'"
+        )
+    qb = get_qb(ctx)
+    
+    count, total, average, minimum, maximum = qb.select(table).aggregate(column)
+    
+    click.echo(f"\n{table}.{column}:")
+    click.echo(f"Count: {count}")
+    click.echo(f"Sum: {total}")
+    click.echo(f"Avg: {average}")
+    click.echo(f"Min: {minimum}")
+    click.echo(f"Max: {maximum}")
+
+
 if __name__ == '__main__':
     cli(obj={})
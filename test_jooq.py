@@ -0,0 +1,213 @@
+import multiprocessing
+import sqlite3
+
+import pytest
+from click.testing import CliRunner
+
+import jooq
+
+
+def make_legacy_database(db_dir, users=3, products=2):
+    """Create a pre-split single-file app.db like the original init_database did"""
+    conn = sqlite3.connect(db_dir / jooq.LEGACY_DB_PATH)
+    conn.execute("""
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            age INTEGER
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            price REAL NOT NULL,
+            stock INTEGER DEFAULT 0
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO users (name, email, age) VALUES (?, ?, ?)",
+        [(f"user{i}", f"user{i}@example.com", 20 + i) for i in range(users)],
+    )
+    conn.executemany(
+        "INSERT INTO products (name, price, stock) VALUES (?, ?, ?)",
+        [(f"product{i}", 1.5 * i, i) for i in range(products)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def close_all(conns):
+    for conn in conns.values():
+        conn.close()
+
+
+def test_legacy_database_is_migrated(tmp_path):
+    make_legacy_database(tmp_path)
+
+    conns = jooq.init_database(str(tmp_path))
+    qb = jooq.QueryBuilder(conns)
+    assert qb.select('users').order_by('id').fields('id', 'email').fetch() == [
+        (1, 'user0@example.com'), (2, 'user1@example.com'), (3, 'user2@example.com'),
+    ]
+    assert len(qb.select('products').fetch()) == 2
+    for conn in conns.values():
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == jooq.SCHEMA_VERSION
+
+    # New rows continue after the migrated ids
+    assert qb.insert('users').values(name='new', email='new@example.com', age=1).execute() == 4
+    close_all(conns)
+
+    # Reopening must not copy the legacy rows a second time
+    conns = jooq.init_database(str(tmp_path))
+    assert len(jooq.QueryBuilder(conns).select('users').fetch()) == 4
+    close_all(conns)
+
+
+def _open_database(db_dir, barrier):
+    barrier.wait()
+    close_all(jooq.init_database(db_dir))
+
+
+@pytest.mark.parametrize('attempt', range(5))
+def test_concurrent_first_open_migrates_once(tmp_path, attempt):
+    make_legacy_database(tmp_path, users=500, products=500)
+
+    ctx = multiprocessing.get_context('fork')
+    barrier = ctx.Barrier(2)
+    workers = [ctx.Process(target=_open_database, args=(str(tmp_path), barrier)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    assert [worker.exitcode for worker in workers] == [0, 0]
+
+    conns = jooq.init_database(str(tmp_path))
+    qb = jooq.QueryBuilder(conns)
+    assert len(qb.select('users').fetch()) == 500
+    assert len(qb.select('products').fetch()) == 500
+    close_all(conns)
+
+
+def run_cli(*args):
+    result = CliRunner().invoke(jooq.cli, list(args), obj={})
+    assert result.exception is None or isinstance(result.exception, SystemExit), result.output
+    return result
+
+
+@pytest.mark.parametrize('command, option, csv_text, error', [
+    ('add-user', '--file', 'name,email,age\na,a@x,1\nb,b@x,abc\n', "line 3: invalid age value 'abc'"),
+    ('add-user', '--file', 'name,email,age\na,a@x,1\n,b@x,2\n', 'line 3: name is required'),
+    ('load-users', '--csv', 'name,email,age\na,a@x,1\nb,b@x,abc\n', "line 3: invalid age value 'abc'"),
+    ('add-product', '--file', 'name,price,stock\na,1.5,1\nb,notaprice,2\n', "line 3: invalid price value 'notaprice'"),
+    ('add-product', '--file', 'name,price,stock\na,1.5,1\nb,,2\n', 'line 3: price is required'),
+])
+def test_csv_import_rejects_bad_cells(tmp_path, monkeypatch, command, option, csv_text, error):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'rows.csv'
+    path.write_text(csv_text)
+
+    result = run_cli(command, option, str(path))
+    assert result.exit_code == 2
+    assert error in result.output
+
+    conns = jooq.init_database(str(tmp_path))
+    qb = jooq.QueryBuilder(conns)
+    assert qb.select('users').fetch() == []
+    assert qb.select('products').fetch() == []
+    close_all(conns)
+
+
+def test_csv_import_converts_types_and_empty_cells(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'users.csv').write_text('name,email,age\na,a@x, 7\nb,b@x,\n')
+    (tmp_path / 'products.csv').write_text('name,price,stock\np,2.5,\n')
+
+    assert run_cli('add-user', '--file', 'users.csv').exit_code == 0
+    assert run_cli('add-product', '--file', 'products.csv').exit_code == 0
+
+    conns = jooq.init_database(str(tmp_path))
+    qb = jooq.QueryBuilder(conns)
+    assert qb.select('users').fields('name', 'age').order_by('id').fetch() == [('a', 7), ('b', None)]
+    assert qb.select('products').fields('name', 'price', 'stock').fetch() == [('p', 2.5, 0)]
+    close_all(conns)
+
+
+@pytest.mark.parametrize('command, option', [('add-user', '--file'), ('load-users', '--csv')])
+def test_csv_import_skips_blank_lines(tmp_path, monkeypatch, command, option):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'users.csv').write_text('name,email,age\na,a@x,1\n\nb,b@x,2\n\n')
+
+    result = run_cli(command, option, 'users.csv')
+    assert result.exit_code == 0, result.output
+
+    conns = jooq.init_database(str(tmp_path))
+    assert jooq.QueryBuilder(conns).select('users').fields('name').order_by('id').fetch() == [('a',), ('b',)]
+    close_all(conns)
+
+
+def test_load_users_with_database_open_elsewhere(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'users.csv').write_text('name,email,age\na,a@x,1\n')
+    close_all(jooq.init_database(str(tmp_path)))
+
+    other = sqlite3.connect(tmp_path / 'users.db')
+    other.execute("SELECT * FROM users").fetchall()
+    result = run_cli('load-users', '--csv', 'users.csv')
+    other.close()
+    assert result.exit_code == 0, result.output
+
+    conns = jooq.init_database(str(tmp_path))
+    assert jooq.QueryBuilder(conns).select('users').fields('name').fetch() == [('a',)]
+    assert conns['users'].execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    close_all(conns)
+
+
+def test_result_cache_sees_commits_from_other_connections(tmp_path):
+    conns = jooq.init_database(str(tmp_path))
+    qb = jooq.QueryBuilder(conns)
+    assert qb.select('users').fields('name').fetch() == []
+
+    other = sqlite3.connect(tmp_path / 'users.db')
+    other.execute("INSERT INTO users (name, email, age) VALUES ('o', 'o@x', 1)")
+    other.commit()
+    other.close()
+
+    # Same query, so only data_version can tell the cached result is stale
+    assert qb.select('users').fields('name').fetch() == [('o',)]
+    close_all(conns)
+
+
+def test_result_cache_cleared_after_rollback(tmp_path):
+    conns = jooq.init_database(str(tmp_path))
+    qb = jooq.QueryBuilder(conns)
+
+    with pytest.raises(RuntimeError):
+        with qb.transaction('users'):
+            qb.insert('users').values(name='t', email='t@x', age=1).execute()
+            assert len(qb.select('users').fetch()) == 1
+            raise RuntimeError
+
+    assert qb.select('users').fetch() == []
+    close_all(conns)
+
+
+def test_result_cache_accepts_unhashable_params(tmp_path):
+    conns = jooq.init_database(str(tmp_path))
+    qb = jooq.QueryBuilder(conns)
+    qb.insert('users').values(name='b', email=b'x', age=1).execute()
+
+    assert qb.select('users').fields('name').where('email = ?', bytearray(b'x')).fetch() == [('b',)]
+    close_all(conns)
+
+
+def test_tsv_output_keeps_special_characters_in_one_field(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conns = jooq.init_database(str(tmp_path))
+    jooq.QueryBuilder(conns).insert('users').values(name='a\tb\nc', email='a@x', age=None).execute()
+    close_all(conns)
+
+    result = run_cli('list-users', '--format', 'tsv')
+    assert result.exit_code == 0
+    assert result.output == 'ID\tName\tEmail\tAge\n1\t"a\tb\nc"\ta@x\t\n'